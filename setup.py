@@ -10,7 +10,7 @@ from pathlib import Path
 import fnmatch
 import htmlmin
 from jsmin import jsmin
-import ujson
+import orjson
 import json
 
 from setuptools import setup, find_packages
@@ -115,7 +115,7 @@ class compileJSON(_build_py):
 
         with open(path, "r") as wizard_json:
             data = wizard_json.read()
-            data_obj = ujson.loads(data)
+            data_obj = orjson.loads(data)
 
             print(('Compiling location wizard "{}"'.format(data_obj["name"])))
 
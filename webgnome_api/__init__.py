@@ -4,11 +4,13 @@
 import logging
 import os
 import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import gevent
+import orjson
 import socketio
-import ujson
 from gevent import pywsgi
 from geventwebsocket.handler import WebSocketHandler
 from pyramid.config import Configurator
@@ -18,6 +20,9 @@ from pyramid_log import Formatter, _DottedLookup, _WrapDict
 from pyramid_redis_sessions import session_factory_from_settings
 from redis import StrictRedis
 
+from webgnome_api.common.helpers import JSON_OPTIONS, OrjsonModule
+from webgnome_api.common.session_management import (get_active_model,
+                                                    get_session_objects)
 from webgnome_api.common.views import cors_policy
 from webgnome_api.socket.sockserv import (WebgnomeNamespace,
                                           WebgnomeSocketioServer)
@@ -67,10 +72,9 @@ def reconcile_directory_settings(settings):
     save_file_dir = settings['save_file_dir']
 
     for d in (save_file_dir,):
-        if not os.path.exists(d):
-            print(('Creating folder {0}'.format(d)))
-            os.mkdir(d)
-        elif not os.path.isdir(d):
+        try:
+            os.makedirs(d, exist_ok=True)
+        except FileExistsError:
             raise EnvironmentError('Folder path {0} '
                                    'is not a directory!!'.format(d))
 
@@ -92,7 +96,7 @@ def load_cors_origins(settings, key):
 
 
 def get_json(request):
-    return ujson.loads(request.text, ensure_ascii=False)
+    return orjson.loads(request.body)
 
 
 def overload_redis_session_factory(settings, config):
@@ -114,6 +118,50 @@ def overload_redis_session_factory(settings, config):
     config.set_session_factory(overloaded_session_factory)
 
 
+class SessionCleanerThread(threading.Thread):
+    '''
+        Listens for Redis pub/sub messages in a daemon thread.
+
+        PubSub.run_in_thread() wakes up every sleep_time seconds to poll
+        for messages.  Here we just block on the pubsub socket until a
+        message comes in.  Our handlers are registered with psubscribe(), so
+        listen() will have already dispatched each message by the time it is
+        yielded to us.
+
+        Handlers can hand slow work off to our worker_pool, so that this
+        thread stays free to receive the next message.
+
+        stop() unsubscribes and closes the pubsub connection, which is what
+        breaks us out of the blocking read, and shuts down the worker pool.
+    '''
+    def __init__(self, pubsub, max_workers=2):
+        super(SessionCleanerThread, self).__init__(daemon=True)
+        self.pubsub = pubsub
+        self.worker_pool = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix='session_cleaner')
+        self._running = True
+
+    def run(self):
+        try:
+            for _msg in self.pubsub.listen():
+                if not self._running:
+                    break
+        except Exception:
+            # a closed connection is expected when we are stopped
+            if self._running:
+                raise
+
+    def stop(self):
+        self._running = False
+
+        try:
+            self.pubsub.punsubscribe()
+        finally:
+            self.pubsub.close()
+            self.worker_pool.shutdown(wait=False)
+
+
 def start_session_cleaner(settings):
     '''
         When a session expires, we need to cleanup the session folder that was
@@ -128,9 +176,7 @@ def start_session_cleaner(settings):
 
     redis = StrictRedis(host=host, port=port)
 
-    def event_handler(msg, session_dir=session_dir):
-        cleanup_dir = os.path.join(str(session_dir), str(msg['data']))
-
+    def remove_session_dir(cleanup_dir):
         try:
             shutil.rmtree(cleanup_dir)
         except OSError as err:
@@ -139,13 +185,24 @@ def start_session_cleaner(settings):
                 print('Session Cleaner: Folder {} does not exist!'
                       .format(cleanup_dir))
             else:
-                raise
+                print('Session Cleaner: Could not remove folder {}: {}'
+                      .format(cleanup_dir, err))
+
+    def event_handler(msg, session_dir=session_dir):
+        cleanup_dir = os.path.join(str(session_dir), str(msg['data']))
+
+        # Removing a large session folder can take a while, so we do it in
+        # the cleaner's worker pool.  This keeps the pubsub thread free to
+        # receive the next expiry event.
+        cleaner.worker_pool.submit(remove_session_dir, cleanup_dir)
 
     pubsub = redis.pubsub()
+    cleaner = SessionCleanerThread(pubsub)
+
     pubsub.psubscribe(**{'__keyevent*__:expired': event_handler})
+    cleaner.start()
 
-    settings['redis_pubsub_thread'] = pubsub.run_in_thread(
-        sleep_time=60.0, daemon=True)
+    settings['redis_pubsub_thread'] = cleaner
 
 
 def server_factory(global_config, host, port):
@@ -157,6 +214,7 @@ def server_factory(global_config, host, port):
             app_settings=global_config,
             api_app=app.application,
             async_mode='gevent',
+            json=OrjsonModule,
             # logger=True,
             # ping_interval=2,
             # ping_timeout=10
@@ -178,12 +236,7 @@ def main(global_config, **settings):
     settings['objects'] = {}
 
     settings['uncertain_models'] = {}
-    try:
-        os.mkdir('ipc_files')
-    except OSError as e:
-        # it is ok if the folder already exists.
-        if e.errno != 17:
-            raise
+    os.makedirs('ipc_files', exist_ok=True)
 
     reconcile_directory_settings(settings)
     load_cors_origins(settings, 'cors_policy.origins')
@@ -193,10 +246,18 @@ def main(global_config, **settings):
 
     overload_redis_session_factory(settings, config)
 
-    # we use ujson to load our JSON payloads
+    # we use orjson to load our JSON payloads
     config.add_request_method(get_json, 'json', reify=True)
 
-    renderer = JSONRenderer(serializer=lambda v, **kw: ujson.dumps(v))
+    # These only need to be looked up once per request
+    config.add_request_method(get_active_model, 'active_model', reify=True)
+    config.add_request_method(get_session_objects, 'session_objects',
+                              reify=True)
+
+    renderer = JSONRenderer(
+        serializer=lambda v, **kw: orjson.dumps(v,
+                                                default=kw.get('default'),
+                                                option=JSON_OPTIONS).decode())
     config.add_renderer('json', renderer)
 
     config.add_tween('webgnome_api.tweens.PyGnomeSchemaTweenFactory')
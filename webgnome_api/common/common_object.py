@@ -9,7 +9,7 @@ import urllib.parse
 import urllib.request
 from collections.abc import Iterable
 
-import ujson
+import orjson
 # this is the entry point in PyGnome
 from gnome.gnomeobject import GnomeId
 from gnome.spill_container import SpillContainerPair
@@ -293,7 +293,7 @@ def get_file_path(request, json_request=None):
     session_dir = get_session_dir(request)
 
     if json_request is None:
-        json_request = ujson.loads(request.body)
+        json_request = orjson.loads(request.body)
 
     if (json_request['filename'].startswith('http') and
             json_request['filename'].find(goods_url) != -1):
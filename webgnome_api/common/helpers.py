@@ -3,13 +3,44 @@ Helper functions to be used by views.
 '''
 
 import logging
+import numbers
+import os
+import shutil
 import sys
 import zipfile
+from collections import defaultdict
 
-import ujson
+import numpy as np
+import orjson
 
 log = logging.getLogger(__name__)
 
+# Our model outputs are full of numpy values, and the uncertainty results
+# are keyed by integer index, neither of which orjson handles by default.
+JSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+# output file types that are already compressed
+compressed_extensions = ('.zip', '.nc', '.gz')
+
+# buffer size used when copying output files into an export zip
+zip_copy_buffer_size = 1 << 20
+
+
+class OrjsonModule(object):
+    '''
+        python-socketio wants a json module that has dumps() and loads()
+        functions dealing in str objects, and it passes in the stdlib
+        keyword args.  orjson deals in bytes and accepts none of those args,
+        so we adapt it here.
+    '''
+    @staticmethod
+    def dumps(obj, *args, **kwargs):
+        return orjson.dumps(obj, option=JSON_OPTIONS).decode('utf-8')
+
+    @staticmethod
+    def loads(s, *args, **kwargs):
+        return orjson.loads(s)
+
 
 def update_savefile(file_path, request):
     '''
@@ -68,7 +99,7 @@ def update_savefile(file_path, request):
                     buffer = zf.read(fname)
                     with zf.open(fname) as json_file:
                         try:
-                            json_ = ujson.load(json_file)
+                            json_ = orjson.loads(json_file.read())
                             if 'obj_type' in json_:
                                 if 'Water' in json_['obj_type'] and 'environment' in json_[
                                         'obj_type'] and water_json is None:
@@ -99,25 +130,26 @@ def update_savefile(file_path, request):
                 # Write modified and new files to zip
                 new_zf.writestr(
                     substance['name'] + '.json',
-                    ujson.dumps(
+                    orjson.dumps(
                         substance,
-                        indent=True))
+                        option=orjson.OPT_INDENT_2))
                 for spill in spills:
                     fn, sp = spill
                     del sp['element_type']
                     sp['substance'] = substance_fn
-                    new_zf.writestr(fn, ujson.dumps(sp, indent=True))
+                    new_zf.writestr(fn, orjson.dumps(
+                        sp, option=orjson.OPT_INDENT_2))
                 for init in inits:
                     fn, init = init
                     init['obj_type'] = init['obj_type'].replace(
                         '.elements.', '.')
                     new_zf.writestr(
-                        fn, ujson.dumps(
-                            init, indent=True))
+                        fn, orjson.dumps(
+                            init, option=orjson.OPT_INDENT_2))
         return file_path + '.updated'
 
     except BaseException:
-        if ('develop_mode' in list(request.registry.settings.keys()) and
+        if ('develop_mode' in request.registry.settings and
                 request.registry.settings['develop_mode'].lower() == 'true'):
             import pdb
             pdb.post_mortem(sys.exc_info()[2])
@@ -126,6 +158,100 @@ def update_savefile(file_path, request):
         # pdb.post_mortem()
 
 
+def weathering_key_order(weathering_output):
+    '''
+        Returns the keys of a WeatheringOutput dict that hold numeric values,
+        in a fixed order.  The keys don't normally change from one step to
+        the next, so this only needs to be figured out once per model run.
+        uncertainty_bounds() checks that the keys still match.
+    '''
+    return tuple(k for k, v in weathering_output.items()
+                 if isinstance(v, numbers.Number) and not isinstance(v, bool))
+
+
+def _python_uncertainty_bounds(weathering_outputs):
+    '''
+        Per-key min() and max() over the union of the keys in our
+        WeatheringOutput dicts.  Keys missing from some of the outputs are
+        reduced over the outputs that have them.
+    '''
+    aggregate = defaultdict(list)
+
+    for o in weathering_outputs:
+        for k, v in o.items():
+            aggregate[k].append(v)
+
+    low = {k: min(v) for k, v in aggregate.items()}
+    high = {k: max(v) for k, v in aggregate.items()}
+
+    return low, high
+
+
+def uncertainty_bounds(weathering_outputs, key_order):
+    '''
+        Takes the WeatheringOutput dicts from our uncertainty models and
+        returns a (low, high) pair of dicts containing the per-key minimum
+        and maximum values.
+
+        When all the outputs have the same keys, the numeric values named in
+        key_order are gathered into a single (n_runs, n_keys) array, and we
+        find the min and max rows for each key in numpy.  The values we
+        return are the original values, so ints stay ints.  Anything else
+        (like the time stamp) is reduced with min() and max().
+
+        If the keys don't match, or the values are not all plain numbers
+        (a None or a NaN, say), we fall back to reducing every key with
+        min() and max(), which gives the same results (or errors) as
+        always.
+    '''
+    first = weathering_outputs[0]
+
+    if (not all(o.keys() == first.keys() for o in weathering_outputs) or
+            not all(k in first for k in key_order)):
+        return _python_uncertainty_bounds(weathering_outputs)
+
+    rows = [[o[k] for k in key_order] for o in weathering_outputs]
+    arr = np.array(rows)
+
+    if (arr.dtype.kind not in 'iuf' or
+            (arr.dtype.kind == 'f' and np.isnan(arr).any())):
+        return _python_uncertainty_bounds(weathering_outputs)
+
+    low = {k: rows[i][j]
+           for j, (k, i) in enumerate(zip(key_order, arr.argmin(axis=0)))}
+    high = {k: rows[i][j]
+            for j, (k, i) in enumerate(zip(key_order, arr.argmax(axis=0)))}
+
+    other_keys = [k for k in first.keys() if k not in low]
+    columns = zip(*[[o[k] for k in other_keys] for o in weathering_outputs])
+
+    for k, column in zip(other_keys, columns):
+        low[k] = min(column)
+        high[k] = max(column)
+
+    # keep the keys in the same order as the outputs
+    return ({k: low[k] for k in first.keys()},
+            {k: high[k] for k in first.keys()})
+
+
+def zip_output_file(zipfile_, filename):
+    '''
+        Streams an output file into a zip archive using large copy buffers.
+        Files that are already compressed are stored as they are, and the
+        rest use the archive's compression method.  The entry keeps the
+        file's modification time and permissions, like ZipFile.write().
+    '''
+    zinfo = zipfile.ZipInfo.from_file(filename, os.path.basename(filename))
+
+    if filename.endswith(compressed_extensions):
+        zinfo.compress_type = zipfile.ZIP_STORED
+    else:
+        zinfo.compress_type = zipfile_.compression
+
+    with open(filename, 'rb') as src, zipfile_.open(zinfo, 'w') as dest:
+        shutil.copyfileobj(src, dest, length=zip_copy_buffer_size)
+
+
 def FQNameToNameAndScope(fully_qualified_name):
     fqn = fully_qualified_name
     return (list(reversed(fqn.rsplit('.', 1)))
@@ -4,7 +4,7 @@ Common Gnome object request handlers.
 import os
 import sys
 import traceback
-import ujson
+import orjson
 import uuid
 import logging
 
@@ -54,7 +54,7 @@ def can_persist(funct):
         configured to do so.
     '''
     def helper(request):
-        if ('can_persist_uploads' in list(request.registry.settings.keys()) and
+        if ('can_persist_uploads' in request.registry.settings and
                 asbool(request.registry.settings['can_persist_uploads'])):
             return funct(request)
         else:
@@ -82,7 +82,7 @@ def cors_exception(request, exception_class, with_stacktrace=False,
     json_exc = json_exception(depth, with_stacktrace)
     if json_exc is not None:
         http_exc.json_body = json_exc
-    if ('develop_mode' in list(request.registry.settings.keys()) and
+    if ('develop_mode' in request.registry.settings and
                 asbool(request.registry.settings['develop_mode'])):
         if with_stacktrace: #remove false to use
             pass
@@ -197,7 +197,7 @@ def create_object(request, implemented_types):
     log.info('>>' + log_prefix)
 
     try:
-        json_request = ujson.loads(request.body)
+        json_request = orjson.loads(request.body)
     except Exception:
         raise cors_exception(request, HTTPBadRequest)
 
@@ -232,7 +232,7 @@ def update_object(request, implemented_types):
     log.info('>>' + log_prefix)
 
     try:
-        json_request = ujson.loads(request.body)
+        json_request = orjson.loads(request.body)
     except Exception:
         raise cors_exception(request, HTTPBadRequest)
 
@@ -316,7 +316,7 @@ def process_upload(request, field_name):
 
     persist_upload = asbool(request.POST.get('persist_upload', False))
 
-    if 'can_persist_uploads' in list(request.registry.settings.keys()):
+    if 'can_persist_uploads' in request.registry.settings:
         can_persist = asbool(request.registry.settings['can_persist_uploads'])
     else:
         can_persist = False
@@ -1,5 +1,4 @@
 import socketio
-import pdb
 import logging
 import base64
 import hashlib
@@ -2,7 +2,7 @@
 Functional tests for the Gnome Environment object Web API
 These include (Wind, Tide, etc.)
 """
-import ujson
+import orjson
 
 from .base import FunctionalTestBase
 
@@ -0,0 +1,144 @@
+"""
+Unit tests for the view helper functions
+"""
+import os
+import zipfile
+
+import numpy as np
+import orjson
+import pytest
+
+from webgnome_api.common.helpers import (JSON_OPTIONS,
+                                         OrjsonModule,
+                                         uncertainty_bounds,
+                                         weathering_key_order,
+                                         zip_output_file)
+
+
+def bounds(weathering_outputs):
+    return uncertainty_bounds(weathering_outputs,
+                              weathering_key_order(weathering_outputs[0]))
+
+
+def test_uncertainty_bounds_mixed_int_float():
+    outputs = [{'time_stamp': '2013-02-13T09:00:00',
+                'amount_released': 1000,
+                'evaporated': 2.5,
+                'floating': 7},
+               {'time_stamp': '2013-02-13T09:00:00',
+                'amount_released': 1000,
+                'evaporated': 0.5,
+                'floating': 9.5}]
+
+    low, high = bounds(outputs)
+
+    assert low == {'time_stamp': '2013-02-13T09:00:00',
+                   'amount_released': 1000,
+                   'evaporated': 0.5,
+                   'floating': 7}
+    assert high == {'time_stamp': '2013-02-13T09:00:00',
+                    'amount_released': 1000,
+                    'evaporated': 2.5,
+                    'floating': 9.5}
+
+    # we return the original values, so ints stay ints
+    assert type(low['amount_released']) is int
+    assert type(low['floating']) is int
+    assert type(high['floating']) is float
+
+    assert list(low.keys()) == list(outputs[0].keys())
+
+
+def test_uncertainty_bounds_non_numeric():
+    outputs = [{'time_stamp': '2013-02-13T10:00:00', 'evaporated': 1.0},
+               {'time_stamp': '2013-02-13T09:00:00', 'evaporated': 2.0}]
+
+    low, high = bounds(outputs)
+
+    assert low == {'time_stamp': '2013-02-13T09:00:00', 'evaporated': 1.0}
+    assert high == {'time_stamp': '2013-02-13T10:00:00', 'evaporated': 2.0}
+
+
+def test_uncertainty_bounds_mismatched_keys():
+    outputs = [{'time_stamp': 't', 'evaporated': 1.0, 'floating': 5.0},
+               {'time_stamp': 't', 'evaporated': 3.0},
+               {'time_stamp': 't', 'evaporated': 2.0, 'beached': 4.0}]
+
+    low, high = bounds(outputs)
+
+    assert low == {'time_stamp': 't', 'evaporated': 1.0,
+                   'floating': 5.0, 'beached': 4.0}
+    assert high == {'time_stamp': 't', 'evaporated': 3.0,
+                    'floating': 5.0, 'beached': 4.0}
+
+
+def test_uncertainty_bounds_stale_key_order():
+    # key order cached from an earlier step, with a key we no longer have
+    outputs = [{'time_stamp': 't', 'evaporated': 1.0},
+               {'time_stamp': 't', 'evaporated': 3.0}]
+
+    low, high = uncertainty_bounds(outputs, ('evaporated', 'floating'))
+
+    assert low == {'time_stamp': 't', 'evaporated': 1.0}
+    assert high == {'time_stamp': 't', 'evaporated': 3.0}
+
+
+def test_uncertainty_bounds_none_value():
+    outputs = [{'time_stamp': 't', 'evaporated': 1.0},
+               {'time_stamp': 't', 'evaporated': None}]
+
+    with pytest.raises(TypeError):
+        bounds(outputs)
+
+
+def test_orjson_module_fragment():
+    # steps are pre-serialized with our options and handed to socketio
+    # as fragments, which need orjson >= 3.9.15
+    step = orjson.Fragment(orjson.dumps({0: np.float64(1.0)},
+                                        option=JSON_OPTIONS))
+
+    assert OrjsonModule.dumps([step]) == '[{"0":1.0}]'
+    assert OrjsonModule.loads(OrjsonModule.dumps([step])) == [{'0': 1.0}]
+
+
+def test_zip_output_file_keeps_metadata(tmp_path):
+    mtime = 1360746000  # 2013-02-13T09:00:00Z
+
+    for name in ('output.json', 'output.nc'):
+        path = tmp_path / name
+        path.write_bytes(b'x' * 4096)
+        os.chmod(path, 0o644)
+        os.utime(path, (mtime, mtime))
+
+    zip_path = tmp_path / 'export.zip'
+    with zipfile.ZipFile(zip_path, 'w', compression=zipfile.ZIP_DEFLATED,
+                         allowZip64=True, compresslevel=1) as zf:
+        zip_output_file(zf, str(tmp_path / 'output.json'))
+        zip_output_file(zf, str(tmp_path / 'output.nc'))
+
+    with zipfile.ZipFile(zip_path) as zf:
+        assert zf.testzip() is None
+
+        deflated = zf.getinfo('output.json')
+        stored = zf.getinfo('output.nc')
+
+        assert deflated.compress_type == zipfile.ZIP_DEFLATED
+        assert stored.compress_type == zipfile.ZIP_STORED
+
+        expected_time = zipfile.ZipInfo.from_file(
+            str(tmp_path / 'output.json')).date_time
+
+        for info in (deflated, stored):
+            assert info.date_time == expected_time
+            assert (info.external_attr >> 16) & 0o777 == 0o644
+            assert zf.read(info) == b'x' * 4096
+
+
+def test_zip_output_file_missing_source(tmp_path):
+    zip_path = tmp_path / 'export.zip'
+
+    # the real error comes through, and the archive can still be closed
+    with pytest.raises(FileNotFoundError):
+        with zipfile.ZipFile(zip_path, 'w',
+                             compression=zipfile.ZIP_DEFLATED) as zf:
+            zip_output_file(zf, str(tmp_path / 'missing.nc'))
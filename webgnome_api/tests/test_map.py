@@ -3,7 +3,7 @@ Functional tests for the Gnome Map object Web API
 """
 from os.path import basename
 import webtest
-import ujson
+import orjson
 
 from .base import FunctionalTestBase
 
@@ -104,7 +104,7 @@ class MapTestBase(FunctionalTestBase):
         self.setup_map_file()
         resp = self.testapp.post('/map/upload',
                                  {'session': '1234',
-                                  'file_list': ujson.dumps(file_names),
+                                  'file_list': orjson.dumps(file_names).decode(),
                                   'name':'Test',
                                   'obj_type':'gnome.maps.map.MapFromBNA'}
                                  )
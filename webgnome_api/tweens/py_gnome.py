@@ -9,7 +9,7 @@ import base64
 import hashlib
 import regex as re
 
-import ujson
+import orjson
 
 from ..common.common_object import ValueIsJsonObject, get_session_dir
 
@@ -90,7 +90,7 @@ class PyGnomeSchemaTweenFactory(object):
         if ('CONTENT_TYPE' in request.environ and
                 request.environ['CONTENT_TYPE'][:16] == 'application/json' and
                 request.body):
-            json_request = ujson.loads(request.body)
+            json_request = orjson.loads(request.body)
             #json_request = self.sanitizeJSON(json_request)
 
             self.add_json_key(json_request)
@@ -103,7 +103,7 @@ class PyGnomeSchemaTweenFactory(object):
             #       and then turn it back into a string.
             #       I tried just leaving it as a JSON object, but the
             #       request body doesn't accept anything but a string.
-            request.body = ujson.dumps(json_request).encode('utf-8')
+            request.body = orjson.dumps(json_request)
 
         self.generate_short_session_id(request)
 
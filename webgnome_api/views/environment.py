@@ -2,7 +2,7 @@
 Views for the Environment objects.
 This currently includes Wind and Tide objects.
 """
-import ujson
+import orjson
 import logging
 import zlib
 import numpy as np
@@ -28,6 +28,7 @@ from webgnome_api.common.views import (get_object,
 
 from cornice import Service
 
+from ..common.helpers import JSON_OPTIONS
 from ..common.session_management import (get_session_object,
                                          acquire_session_lock)
 log = logging.getLogger(__name__)
@@ -100,7 +101,7 @@ def upload_environment(request):
 
 
     file_list = request.POST['file_list']
-    file_list = ujson.loads(file_list)
+    file_list = orjson.loads(file_list)
     name = request.POST['name']
     file_name = file_list[0]
 
@@ -108,13 +109,13 @@ def upload_environment(request):
              .format(log_prefix, file_name, name))
 
     env_type = request.POST.get('obj_type', [])
-    request.body = ujson.dumps({'obj_type': env_type,
-                                'filename': file_name,
-                                'name': name
-                                }).encode('utf-8')
+    request.body = orjson.dumps({'obj_type': env_type,
+                                 'filename': file_name,
+                                 'name': name
+                                 })
 
     env_obj = create_environment(request)
-    resp = Response(ujson.dumps(env_obj))
+    resp = Response(orjson.dumps(env_obj, option=JSON_OPTIONS))
 
     log.info('<<{}'.format(log_prefix))
     return cors_response(request, resp)
@@ -135,7 +136,7 @@ def activate_environment(request):
     log.info('>>{}'.format(log_prefix))
 
     file_name, name = activate_uploaded(request)
-    resp = Response(ujson.dumps({'filename': file_name, 'name': name}))
+    resp = Response(orjson.dumps({'filename': file_name, 'name': name}))
 
     log.info('<<{}'.format(log_prefix))
     return cors_response(request, resp)
@@ -3,7 +3,7 @@ Views for file download operations.
 """
 from os import walk
 from os.path import isfile, isdir, basename, join, sep
-import ujson
+import orjson
 import logging
 import zipfile
 
@@ -2,7 +2,7 @@
 Views for the Environment objects.
 This currently includes Wind and Tide objects.
 """
-import ujson
+import orjson
 import logging
 import zlib
 import numpy as np
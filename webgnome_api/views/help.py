@@ -5,7 +5,7 @@ from os import walk
 from os.path import sep, join, isfile, isdir
 
 import time
-import ujson
+import orjson
 import urllib.request, urllib.parse, urllib.error
 import redis
 
@@ -84,7 +84,7 @@ def get_help(request):
 def create_help_feedback(request):
     '''Creates a feedback entry for the given help section'''
     try:
-        json_request = ujson.loads(request.body)
+        json_request = orjson.loads(request.body)
     except Exception:
         raise cors_exception(request, HTTPBadRequest)
 
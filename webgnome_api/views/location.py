@@ -8,7 +8,7 @@ from threading import current_thread
 
 from geojson import FeatureCollection, Feature, Point
 
-import ujson
+import orjson
 import slugify
 
 from pyramid.httpexceptions import HTTPNotFound, HTTPInternalServerError
@@ -46,7 +46,7 @@ def get_location(request):
 
     for (path, _dirnames, filenames) in walk(locations_dir):
         if len(path.split(sep)) == base_len + 1:
-            [location_content.append(ujson.load(open(join(path, f), 'r')))
+            [location_content.append(orjson.loads(open(join(path, f), 'rb').read()))
              for f in filenames
              if f == 'compiled.json']
 
@@ -1,7 +1,7 @@
 """
 Views for the Map objects.
 """
-import ujson
+import orjson
 import logging
 import os
 import zlib
@@ -40,7 +40,7 @@ from webgnome_api.common.session_management import (init_session_objects,
                                                     set_session_object,
                                                     acquire_session_lock)
 
-from webgnome_api.common.helpers import JSONImplementsOneOf
+from webgnome_api.common.helpers import JSON_OPTIONS, JSONImplementsOneOf
 
 map_api = Service(name='map', path='/map*obj_id',
                   description="Map API", cors_policy=cors_policy)
@@ -89,7 +89,7 @@ def create_map(request):
 def update_map(request):
     '''Updates a Gnome Map object.'''
     try:
-        json_request = ujson.loads(request.body.decode('utf-8'))
+        json_request = orjson.loads(request.body)
     except Exception:
         raise cors_exception(request, HTTPBadRequest)
 
@@ -123,7 +123,7 @@ def upload_map(request):
 
 
     file_list = request.POST['file_list']
-    file_list = ujson.loads(file_list)
+    file_list = orjson.loads(file_list)
     name = request.POST['name']
     file_name = file_list[0]
 
@@ -131,14 +131,14 @@ def upload_map(request):
              .format(log_prefix, file_name, name))
 
     # fixme: why is this not just calling the pygnome code directly?
-    request.body = ujson.dumps({'obj_type': 'gnome.maps.map.MapFromBNA',
-                                'filename': file_name,
-                                'refloat_halflife': 6.0,
-                                'name': name
-                                }).encode('utf-8')
+    request.body = orjson.dumps({'obj_type': 'gnome.maps.map.MapFromBNA',
+                                 'filename': file_name,
+                                 'refloat_halflife': 6.0,
+                                 'name': name
+                                 })
 
     map_obj = create_map(request)
-    resp = Response(ujson.dumps(map_obj))
+    resp = Response(orjson.dumps(map_obj, option=JSON_OPTIONS))
 
     log.info('<<{}'.format(log_prefix))
     return cors_response(request, resp)
@@ -161,14 +161,14 @@ def activate_map(request):
     file_name, name = activate_uploaded(request)
     file_path = file_name.split(os.path.sep)[-1]
 
-    request.body = ujson.dumps({'obj_type': 'gnome.maps.map.MapFromBNA',
-                                'filename': file_path,
-                                'refloat_halflife': 6.0,
-                                'name': name
-                                }).encode('utf-8')
+    request.body = orjson.dumps({'obj_type': 'gnome.maps.map.MapFromBNA',
+                                 'filename': file_path,
+                                 'refloat_halflife': 6.0,
+                                 'name': name
+                                 })
 
     map_obj = create_map(request)
-    resp = Response(ujson.dumps(map_obj))
+    resp = Response(orjson.dumps(map_obj, option=JSON_OPTIONS))
 
     log.info('<<{}'.format(log_prefix))
     return cors_response(request, resp)
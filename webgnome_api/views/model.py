@@ -8,7 +8,7 @@ import subprocess
 from threading import current_thread
 
 import gnome.scripting as gs
-import ujson
+import orjson
 from cornice import Service
 from gnome.model import Model
 from pyramid.httpexceptions import (HTTPBadRequest, HTTPNotFound,
@@ -19,7 +19,7 @@ from webgnome_api.common.common_object import (CreateObject, UpdateObject,
                                                clean_session_dir,
                                                obj_id_from_req_payload,
                                                obj_id_from_url)
-from webgnome_api.common.helpers import JSONImplementsOneOf
+from webgnome_api.common.helpers import JSON_OPTIONS, JSONImplementsOneOf
 from webgnome_api.common.session_management import (acquire_session_lock,
                                                     get_active_model,
                                                     get_session_object,
@@ -76,7 +76,7 @@ def create_mike_hd_config(request):
     if not os.path.exists(config_path):
         os.makedirs(config_path)
     with open(os.path.join(config_path, 'Config.json'), 'w') as f:
-        f.write(ujson.dumps(config))
+        f.write(orjson.dumps(config).decode())
 
 
 mike_hd_status_file = r'C:\temp\webgnome_mike_hd_status.txt'
@@ -206,8 +206,8 @@ def run_mikehd(request):
     '''
     create_mike_hd_config(request)
     code, drescription = run_hd()
-    return cors_response(request, Response(ujson.dumps(
-        {'code': code, 'description': drescription})))
+    return cors_response(request, Response(orjson.dumps(
+        {'code': code, 'description': drescription}, option=JSON_OPTIONS)))
 
 
 @mikehdnetcdf.post()
@@ -223,7 +223,7 @@ def get_mikehd_netcdf(request):
     status = get_hd_status()
     if status == 1 or status == -1:
         return cors_response(request, Response(
-            ujson.dumps({'error_code': status})))
+            orjson.dumps({'error_code': status})))
 
     # copy netcdf to session folder
     file_name, filepath = copy_netcdf(request)
@@ -250,16 +250,16 @@ def get_mikehd_netcdf(request):
             env_obj_base_json['obj_type'] = ('gnome.environment'
                                              '.environment_objects.GridCurrent')
             basic_json['current'] = env_obj_base_json
-        request.body = ujson.dumps(basic_json).encode('utf-8')
+        request.body = orjson.dumps(basic_json)
 
         mover_obj = create_mover(request)
-        resp = Response(ujson.dumps(mover_obj))
+        resp = Response(orjson.dumps(mover_obj, option=JSON_OPTIONS))
 
         return cors_response(request, resp)
     else:
         # netcdf file is not ready
         return cors_response(request, Response(
-            ujson.dumps({'error_code': 0})))
+            orjson.dumps({'error_code': 0})))
 
 
 @model.get()
@@ -303,7 +303,7 @@ def create_model(request):
     log.info('>>' + log_prefix)
 
     try:
-        json_request = ujson.loads(request.body.decode('utf-8'))
+        json_request = orjson.loads(request.body)
     except Exception:
         json_request = None
 
@@ -354,7 +354,7 @@ def update_model(request):
 
     ret = None
     try:
-        json_request = ujson.loads(request.body.decode('utf-8'))
+        json_request = orjson.loads(request.body)
     except Exception:
         raise cors_exception(request, HTTPBadRequest)
 
@@ -7,7 +7,7 @@ import logging
 import zlib
 from threading import current_thread
 
-import ujson
+import orjson
 
 import numpy as np
 
@@ -28,6 +28,7 @@ from ..common.views import (get_object,
                             cors_exception,
                             switch_to_existing_session)
 
+from ..common.helpers import JSON_OPTIONS
 from ..common.session_management import (get_session_object,
                                          acquire_session_lock)
 from netCDF4 import Dataset, num2date, date2num
@@ -94,7 +95,7 @@ def upload_mover(request):
     log.info('>>{}'.format(log_prefix))
 
     file_list = request.POST['file_list']
-    file_list = ujson.loads(file_list)
+    file_list = orjson.loads(file_list)
     name = request.POST['name']
     file_name = file_list
     
@@ -145,10 +146,10 @@ def upload_mover(request):
     if ('wind_movers.WindMover' in mover_type):
         basic_json['wind'] = wind_json
 
-    request.body = ujson.dumps(basic_json).encode('utf-8')
+    request.body = orjson.dumps(basic_json)
 
     mover_obj = create_mover(request)
-    resp = Response(ujson.dumps(mover_obj))
+    resp = Response(orjson.dumps(mover_obj, option=JSON_OPTIONS))
 
     log.info('<<{}'.format(log_prefix))
     return cors_response(request, resp)
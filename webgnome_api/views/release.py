@@ -1,7 +1,7 @@
 """
 Views for the Release objects.
 """
-import ujson
+import orjson
 import logging
 import zlib
 from threading import current_thread
@@ -36,7 +36,7 @@ from webgnome_api.common.session_management import (init_session_objects,
                                                     set_session_object,
                                                     acquire_session_lock)
 
-from webgnome_api.common.helpers import JSONImplementsOneOf
+from webgnome_api.common.helpers import JSON_OPTIONS, JSONImplementsOneOf
 
 from cornice import Service
 
@@ -150,7 +150,7 @@ def upload_release(request):
     log.info('>>{}'.format(log_prefix))
 
     file_list = request.POST.pop('file_list')
-    file_list = ujson.loads(file_list)
+    file_list = orjson.loads(file_list)
     name = request.POST.pop('name')
     file_name = file_list
 
@@ -167,10 +167,10 @@ def upload_release(request):
     release_json.update(request.POST)
     release_json.pop('session')
 
-    request.body = ujson.dumps(release_json).encode('utf-8')
+    request.body = orjson.dumps(release_json)
 
     release_obj = create_release(request)
-    resp = Response(ujson.dumps(release_obj))
+    resp = Response(orjson.dumps(release_obj, option=JSON_OPTIONS))
 
     log.info('<<{}'.format(log_prefix))
     return cors_response(request, resp)
\ No newline at end of file
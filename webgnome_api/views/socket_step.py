@@ -1,27 +1,26 @@
 import logging
 import os
-import pdb
 import shutil
 import sys
 import tempfile
 import time
 import traceback
 import zipfile
-from collections import defaultdict
 from threading import current_thread
 
 import gevent
-import ujson
+import orjson
 from cornice import Service
 from greenlet import GreenletExit
 from pyramid.httpexceptions import (HTTPNotFound, HTTPPreconditionFailed,
                                     HTTPUnprocessableEntity)
 from pyramid.response import FileResponse
 from webgnome_api.common.common_object import CreateObject, get_session_dir
+from webgnome_api.common.helpers import (JSON_OPTIONS, uncertainty_bounds,
+                                         weathering_key_order,
+                                         zip_output_file)
 from webgnome_api.common.session_management import (acquire_session_lock,
                                                     drop_uncertain_models,
-                                                    get_active_model,
-                                                    get_session_objects,
                                                     get_uncertain_models,
                                                     set_uncertain_models)
 from webgnome_api.common.views import (cors_exception, cors_policy,
@@ -41,6 +40,11 @@ sess_namespaces = {}
 
 log = logging.getLogger(__name__)
 
+# our log messages are prefixed with the request id and the function name
+log_prefix_fmt = 'req%d: %s'
+log_enter_fmt = '>>' + log_prefix_fmt
+log_exit_fmt = '<<' + log_prefix_fmt
+
 class GnomeRuntimeError(Exception):
     pass
 
@@ -51,17 +55,18 @@ def get_greenlet_logger(request):
 
 @export_api.get()
 def get_output_file(request):
-    log_prefix = 'req{0}: get_output_file()'.format(id(request))
-    log.info('>>' + log_prefix)
+    log.info(log_enter_fmt, id(request), 'get_output_file()')
     session_path = get_session_dir(request)
     filename = request.GET.get('filename')
     if filename:
         output_path = os.path.join(session_path, filename)
 
+        basename = os.path.basename(output_path)
+
         response = FileResponse(output_path, request)
-        response.headers['Content-Disposition'] = ("attachment; filename={0}"
-                                                    .format(os.path.basename(output_path)))
-        log.info('<<' + log_prefix)
+        response.headers['Content-Disposition'] = (f'attachment; '
+                                                   f'filename={basename}')
+        log.info(log_exit_fmt, id(request), 'get_output_file()')
         return response
     else:
         raise cors_response(request, HTTPNotFound('File(s) requested do not '
@@ -79,28 +84,29 @@ def run_export_model(request):
     When the greenlet running the model dies, it removes the outputters that were added
     via a linked function
     '''
-    print('async export hit')
-    log_prefix = 'req{0}: run_export_model()'.format(id(request))
-    log.info('>>' + log_prefix)
+    log.debug('async export hit')
+    log.info(log_enter_fmt, id(request), 'run_export_model()')
 
+    settings = request.registry.settings
     sess_id = request.session.session_id
     ns = request.registry.get('sio_ns')
 
     if ns is None:
         raise ValueError('no namespace associated with session')
     
-    active_model = get_active_model(request)
+    active_model = request.active_model
 
     #setup temporary outputters and temporary output directory
     session_path = get_session_dir(request)
     temporary_outputters = []
-    payload = ujson.loads(request.body)
+    payload = request.json
     outpjson = payload['outputters']
     model_filename = payload['model_name']
     td = tempfile.mkdtemp()
+    sess_objs = request.session_objects
     for itm in list(outpjson.values()):
         itm['filename'] = os.path.join(td, itm['filename'])
-        obj = CreateObject(itm, get_session_objects(request))
+        obj = CreateObject(itm, sess_objs)
         temporary_outputters.append(obj)
     for o in temporary_outputters:
         #separated these just in case an exception occurs when
@@ -109,7 +115,7 @@ def run_export_model(request):
         active_model.outputters += o
         log.info('attaching export outputter: ' + o.filename)
 
-    sid = ns.get_sockid_from_sessid(request.session.session_id)
+    sid = ns.get_sockid_from_sessid(sess_id)
 
     def get_export_cleanup():
         def cleanup(grn):
@@ -131,13 +137,15 @@ def run_export_model(request):
                     if len(temporary_outputters) > 1:
                         #need to zip up outputs
                         end_filename = model_filename + '_output.zip'
-                        zipfile_ = zipfile.ZipFile(os.path.join(session_path, end_filename), 'w',
-                                                compression=zipfile.ZIP_DEFLATED)
-                        for m in temporary_outputters:
-                            obj_fn = m.filename
-                            if not os.path.exists(obj_fn):
-                                obj_fn = obj_fn + '.zip' #special case for shapefile outputter which strips extensions...
-                            zipfile_.write(obj_fn, os.path.basename(obj_fn))
+                        with zipfile.ZipFile(os.path.join(session_path, end_filename), 'w',
+                                             compression=zipfile.ZIP_DEFLATED,
+                                             allowZip64=True,
+                                             compresslevel=1) as zipfile_:
+                            for m in temporary_outputters:
+                                obj_fn = m.filename
+                                if not os.path.exists(obj_fn):
+                                    obj_fn = obj_fn + '.zip' #special case for shapefile outputter which strips extensions...
+                                zip_output_file(zipfile_, obj_fn)
                     else:
                         #only one output file, because one outputter selected
                         obj_fn = temporary_outputters[0].filename
@@ -150,8 +158,7 @@ def run_export_model(request):
                     ns.emit('export_finished', end_filename, room=sid)
 
             except Exception:
-                if ('develop_mode' in list(request.registry.settings.keys()) and
-                            request.registry.settings['develop_mode'].lower() == 'true'):
+                if settings.get('develop_mode', '').lower() == 'true':
                     import pdb
                     pdb.post_mortem(sys.exc_info()[2])
                 raise
@@ -172,7 +179,7 @@ def run_export_model(request):
             gl.link(get_export_cleanup())
             return None
         else:
-            print("Already started")
+            log.debug('Already started')
             return None
 
 
@@ -184,9 +191,8 @@ def run_model(request):
     web socket. Until interrupted using halt_model(), it will run to
     completion
     '''
-    print('async_step route hit')
-    log_prefix = 'req{0}: run_model()'.format(id(request))
-    log.info('>>' + log_prefix)
+    log.debug('async_step route hit')
+    log.info(log_enter_fmt, id(request), 'run_model()')
 
     sess_id = request.session.session_id
     ns = request.registry.get('sio_ns')
@@ -194,8 +200,8 @@ def run_model(request):
     if ns is None:
         raise ValueError('no namespace associated with session')
 
-    active_model = get_active_model(request)
-    sid = ns.get_sockid_from_sessid(request.session.session_id)
+    active_model = request.active_model
+    sid = ns.get_sockid_from_sessid(sess_id)
     if sid is None:
         raise ValueError('no sock_session associated with pyramid_session')
     with ns.session(sid) as sock_session:
@@ -210,7 +216,7 @@ def run_model(request):
             gl.session_hash = request.session_hash
             return None
         else:
-            print("Already started")
+            log.debug('Already started')
             return None
 
 
@@ -225,22 +231,44 @@ def execute_async_model(
     Meant to run in a greenlet. This function should take an active model
     and run it, writing each step's output to the socket.
     '''
-    print(request.session_hash)
     log = get_greenlet_logger(request)
-    log_prefix = 'req{0}: execute_async_model()'.format(id(request))
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug(request.session_hash)
+    log_prefix = log_prefix_fmt % (id(request), 'execute_async_model()')
     sock_session_copy = socket_namespace.get_session(sockid) #use get_session to get a clone of the session
+
+    # Optionally coalesce step outputs into a single 'step_batch' message.
+    # A batch size of 1 keeps the one 'step' message per step behavior.
+    settings = request.registry.settings
+    batch_size = int(settings.get('step_batch_size', 1))
+    batch_ms = float(settings.get('step_batch_ms', 100))
+    batch = []
+    last_flush = time.monotonic()
+
+    def flush_batch():
+        nonlocal batch, last_flush
+        if batch:
+            socket_namespace.emit('step_batch', batch, room=sockid)
+            batch = []
+        last_flush = time.monotonic()
+
     try:
         wait_time = 16
         socket_namespace.emit('prepared', room=sockid)
+        # The lock is a gevent Event that lives for the life of the socket
+        # session, so we only need to fetch it once.
         with socket_namespace.session(sockid) as sock_session:
-            unlocked = sock_session['lock'].wait(wait_time)
-            if not unlocked:
-                socket_namespace.emit('timeout',
-                                        'Model not started, timed out after '
-                                        '{0} sec'.format(wait_time), room=sockid)
-                socket_namespace.on_model_kill(sockid)
+            lock = sock_session['lock']
+
+        unlocked = lock.wait(wait_time)
+        if not unlocked:
+            socket_namespace.emit('timeout',
+                                    'Model not started, timed out after '
+                                    '{0} sec'.format(wait_time), room=sockid)
+            socket_namespace.on_model_kill(sockid)
 
         log.info('model run triggered')
+        key_order = None
         while True:
             output = None
             try:
@@ -255,22 +283,18 @@ def execute_async_model(
                         log.info('Model does not have '
                                     'weathering uncertainty')
 
-                begin = time.time()
+                begin = time.perf_counter_ns()
 
                 output = active_model.step()
 
-                begin_uncertain = time.time()
+                begin_uncertain = time.perf_counter_ns()
                 steps = get_uncertain_steps(request)
-                end = time.time()
+                end = time.perf_counter_ns()
 
                 if steps and 'WeatheringOutput' in output:
                     nominal = output['WeatheringOutput']
-                    aggregate = defaultdict(list)
-                    low = {}
-                    high = {}
-                    full_output = {}
 
-                    for idx, step_output in enumerate(steps):
+                    for step_output in steps:
                         # step_output could contain an exception from one
                         # of our uncertainty worker processes.  If so, then
                         # we should propagate the exception with its
@@ -280,24 +304,28 @@ def execute_async_model(
                                 isinstance(step_output[1], Exception)):
                             raise step_output[1].with_traceback(step_output[2])
 
-                        for k, v in step_output['WeatheringOutput'].items():
-                            aggregate[k].append(v)
+                    weathering_outputs = [s['WeatheringOutput']
+                                          for s in steps]
+
+                    if key_order is None:
+                        key_order = weathering_key_order(
+                            weathering_outputs[0])
 
-                    for k, v in aggregate.items():
-                        low[k] = min(v)
-                        high[k] = max(v)
+                    low, high = uncertainty_bounds(weathering_outputs,
+                                                   key_order)
 
                     full_output = {'time_stamp': nominal['time_stamp'],
                                     'nominal': nominal,
                                     'low': low,
                                     'high': high}
 
-                    for idx, step_output in enumerate(steps):
-                        full_output[idx] = step_output['WeatheringOutput']
+                    for idx, weathering_output in enumerate(
+                            weathering_outputs):
+                        full_output[idx] = weathering_output
 
                     output['WeatheringOutput'] = full_output
-                    output['uncertain_response_time'] = end - begin_uncertain
-                    output['total_response_time'] = end - begin
+                    output['uncertain_response_time'] = (end - begin_uncertain) / 1e9
+                    output['total_response_time'] = (end - begin) / 1e9
                 elif 'WeatheringOutput' in output:
                     nominal = output['WeatheringOutput']
                     full_output = {'time_stamp': nominal['time_stamp'],
@@ -306,18 +334,16 @@ def execute_async_model(
                                     'high': None}
 
                     output['WeatheringOutput'] = full_output
-                    output['uncertain_response_time'] = end - begin_uncertain
-                    output['total_response_time'] = end - begin
+                    output['uncertain_response_time'] = (end - begin_uncertain) / 1e9
+                    output['total_response_time'] = (end - begin) / 1e9
             except StopIteration:
-                log.info('  {} stop iteration exception...'
-                            .format(log_prefix))
+                log.info('  %s stop iteration exception...', log_prefix)
                 drop_uncertain_models(request)
                 break
             except Exception:
                 exc_type, exc_value, _exc_traceback = sys.exc_info()
                 traceback.print_exc()
-                if ('develop_mode' in list(request.registry.settings.keys()) and
-                            request.registry.settings['develop_mode'].lower() == 'true'):
+                if settings.get('develop_mode', '').lower() == 'true':
                     import pdb
                     pdb.post_mortem(sys.exc_info()[2])
 
@@ -330,38 +356,58 @@ def execute_async_model(
             sock_session_copy['num_sent'] += 1
             log.debug(sock_session_copy['num_sent'])
             if output and send_output:
-                socket_namespace.emit('step', output, room=sockid)
+                # Serialize the step once up front.  The socketio packet
+                # encoder (orjson) embeds the fragment as-is rather than
+                # walking the output dict again.
+                payload = orjson.Fragment(orjson.dumps(output,
+                                                       option=JSON_OPTIONS))
+
+                if batch_size > 1:
+                    batch.append(payload)
+
+                    if (len(batch) >= batch_size or
+                            (time.monotonic() - last_flush) * 1000 >= batch_ms):
+                        flush_batch()
+                else:
+                    socket_namespace.emit('step', payload, room=sockid)
             else:
                 socket_namespace.emit('step', sock_session_copy['num_sent'])
 
             if not socket_namespace.is_async:
-                with socket_namespace.session(sockid) as sock_session:
-                    sock_session['lock'].clear()
-                    print('lock!')
+                # the client acks each step, so it needs to have them all
+                flush_batch()
+
+                lock.clear()
+                if log.isEnabledFor(logging.DEBUG):
+                    log.debug('lock')
 
             # kill greenlet after 100 minutes unless unlocked
             wait_time = 6000
-            with socket_namespace.session(sockid) as sock_session:
-                sock_session['lock'].wait(wait_time)
-                print('lock!')
-                unlocked = sock_session['lock']
-                if not unlocked:
-                    socket_namespace.emit('timeout',
-                                            'Model run timed out after {0} sec'
-                                            .format(wait_time), room=sockid)
-                    socket_namespace.on_model_kill(sockid)
+            if not lock.is_set():
+                # don't hold on to steps while the run is halted
+                flush_batch()
+
+            unlocked = lock.wait(wait_time)
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug('lock')
+            if not unlocked:
+                socket_namespace.emit('timeout',
+                                        'Model run timed out after {0} sec'
+                                        .format(wait_time), room=sockid)
+                socket_namespace.on_model_kill(sockid)
 
             gevent.sleep(0.001)
     except GreenletExit:
         log.info('Greenlet exiting early')
+        # the client stops listening for steps once it sees 'killed'
+        batch.clear()
         socket_namespace.emit('killed', 'Model run terminated early', room=sockid)
         raise
 
     except Exception:
         exc_type, exc_value, _exc_traceback = sys.exc_info()
         traceback.print_exc()
-        if ('develop_mode' in list(request.registry.settings.keys()) and
-                    request.registry.settings['develop_mode'].lower() == 'true'):
+        if settings.get('develop_mode', '').lower() == 'true':
             import pdb
             pdb.post_mortem(sys.exc_info()[2])
 
@@ -372,6 +418,7 @@ def execute_async_model(
         log.info('Greenlet terminated due to exception')
 
         json_exc = json_exception(2, True)
+        batch.clear()
         socket_namespace.emit('runtimeError', json_exc['message'], room=sockid)
         raise
 
@@ -382,6 +429,7 @@ def execute_async_model(
                     log.info('{0} session property {1} changing from {2} to {3}'.format(sockid, k, v, sock_session_copy[k]))
         socket_namespace.save_session(sockid, sock_session_copy)
 
+    flush_batch()
     socket_namespace.emit('complete', 'Model run completed')
 
 def get_uncertain_steps(request):
@@ -391,13 +439,15 @@ def get_uncertain_steps(request):
     else:
         return None
 
+
 @rewind_api.get()
 def get_rewind(request):
     '''
         rewinds the current active Model.
     '''
-    print('rewinding', request.session.session_id)
-    active_model = get_active_model(request)
+    sess_id = request.session.session_id
+    log.debug('rewinding %s', sess_id)
+    active_model = request.active_model
     ns = request.registry.get('sio_ns')
     if active_model:
         session_lock = acquire_session_lock(request)
@@ -406,7 +456,7 @@ def get_rewind(request):
 
         try:
             if ns:
-                sio = ns.get_sockid_from_sessid(request.session.session_id)
+                sio = ns.get_sockid_from_sessid(sess_id)
                 if (ns.active_greenlets.get(sio)):
                     with ns.session(sio) as sock_session:
                         ns.active_greenlets.get(sio).kill(block=False)
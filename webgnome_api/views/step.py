@@ -2,7 +2,6 @@
 Views for the Location objects.
 """
 import time
-from collections import defaultdict
 import logging
 from threading import current_thread
 
@@ -13,6 +12,8 @@ from cornice import Service
 
 from gnome.weatherers import Skimmer, Burn, ChemicalDispersion
 
+from webgnome_api.common.helpers import (uncertainty_bounds,
+                                         weathering_key_order)
 from webgnome_api.common.session_management import (get_active_model,
                                                     get_uncertain_models,
                                                     drop_uncertain_models,
@@ -67,12 +68,8 @@ def get_step(request):
 
             if steps and 'WeatheringOutput' in output:
                 nominal = output['WeatheringOutput']
-                aggregate = defaultdict(list)
-                low = {}
-                high = {}
-                full_output = {}
 
-                for idx, step_output in enumerate(steps):
+                for step_output in steps:
                     # step_output could contain an exception from one
                     # of our uncertainty worker processes.  If so, then
                     # we should propagate the exception with its original
@@ -82,19 +79,17 @@ def get_step(request):
                             isinstance(step_output[1], Exception)):
                         raise step_output[1].with_traceback(step_output[2])
 
-                    for k, v in step_output['WeatheringOutput'].items():
-                        aggregate[k].append(v)
-
-                for k, v in aggregate.items():
-                    low[k] = min(v)
-                    high[k] = max(v)
+                weathering_outputs = [s['WeatheringOutput'] for s in steps]
+                low, high = uncertainty_bounds(
+                    weathering_outputs,
+                    weathering_key_order(weathering_outputs[0]))
 
                 full_output = {'time_stamp': nominal['time_stamp'],
                                'nominal': nominal,
                                'low': low,
                                'high': high}
-                for idx, step_output in enumerate(steps):
-                    full_output[idx] = step_output['WeatheringOutput']
+                for idx, weathering_output in enumerate(weathering_outputs):
+                    full_output[idx] = weathering_output
 
                 output['WeatheringOutput'] = full_output
                 output['uncertain_response_time'] = end - begin_uncertain
@@ -175,25 +170,18 @@ def get_full_run(request):
 
             if steps and 'WeatheringOutput' in output:
                 nominal = output['WeatheringOutput']
-                aggregate = defaultdict(list)
-                low = {}
-                high = {}
-                full_output = {}
-
-                for idx, step_output in enumerate(steps):
-                    for k, v in step_output['WeatheringOutput'].items():
-                        aggregate[k].append(v)
 
-                for k, v in aggregate.items():
-                    low[k] = min(v)
-                    high[k] = max(v)
+                weathering_outputs = [s['WeatheringOutput'] for s in steps]
+                low, high = uncertainty_bounds(
+                    weathering_outputs,
+                    weathering_key_order(weathering_outputs[0]))
 
                 full_output = {'time_stamp': nominal['time_stamp'],
                                'nominal': nominal,
                                'low': low,
                                'high': high}
-                for idx, step_output in enumerate(steps):
-                    full_output[idx] = step_output['WeatheringOutput']
+                for idx, weathering_output in enumerate(weathering_outputs):
+                    full_output[idx] = weathering_output
 
                 output['WeatheringOutput'] = full_output
                 output['total_response_time'] = end - begin
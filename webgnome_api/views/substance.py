@@ -13,8 +13,9 @@ from webgnome_api.common.views import (get_object,
                                        can_persist,
                                        switch_to_existing_session,
                                        activate_uploaded)
+from webgnome_api.common.helpers import JSON_OPTIONS
 
-import ujson
+import orjson
 
 from pyramid.response import Response
 from pyramid.view import view_config
@@ -63,7 +64,7 @@ def upload_substance(request):
     log.info('>>{}'.format(log_prefix))
 
     file_list = request.POST.pop('file_list')
-    file_list = ujson.loads(file_list)
+    file_list = orjson.loads(file_list)
     name = request.POST.pop('name')
     file_name = file_list[0]
 
@@ -77,10 +78,10 @@ def upload_substance(request):
                     'name': name
     }
 
-    request.body = ujson.dumps(substance_json).encode('utf-8')
+    request.body = orjson.dumps(substance_json)
 
     substance_obj = create_substance(request)
-    resp = Response(ujson.dumps(substance_obj))
+    resp = Response(orjson.dumps(substance_obj, option=JSON_OPTIONS))
 
     log.info('<<{}'.format(log_prefix))
     return cors_response(request, resp)
\ No newline at end of file
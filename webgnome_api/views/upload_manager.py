@@ -5,7 +5,7 @@ import os
 import errno
 import logging
 import urllib.request, urllib.parse, urllib.error
-import ujson
+import orjson
 
 from pyramid.settings import asbool
 from pyramid.interfaces import ISessionFactory
@@ -90,7 +90,7 @@ def modify_filesystem(request):
     base_path = get_persistent_dir(request)
 
     try:
-        file_model = PyObjFromJson(ujson.loads(request.body))
+        file_model = PyObjFromJson(orjson.loads(request.body))
     except Exception:
         raise cors_exception(request, HTTPBadRequest)
 
@@ -111,16 +111,16 @@ def modify_filesystem(request):
     '''
     if (request.POST.get('action', None) == 'upload_files'):
         paths, filename = process_upload(request)
-        resp = Response(ujson.dumps(paths))
+        resp = Response(orjson.dumps(paths))
         return resp
 
     if (request.POST.get('action', None) == 'activate_file'):
-        filelist = ujson.loads(request.POST.get('filelist'))
+        filelist = orjson.loads(request.POST.get('filelist'))
         upload_dir = os.path.relpath(get_persistent_dir(request))
         paths = []
         for f in filelist:
             paths.append(os.path.join(upload_dir, f))
-        resp = Response(ujson.dumps(paths))
+        resp = Response(orjson.dumps(paths))
         return resp
 
     sub_folders = [urllib.parse.unquote(d).encode('utf8')
@@ -130,7 +130,7 @@ def modify_filesystem(request):
     base_path = get_persistent_dir(request)
 
     try:
-        file_model = PyObjFromJson(ujson.loads(request.body))
+        file_model = PyObjFromJson(orjson.loads(request.body))
     except Exception:
         raise cors_exception(request, HTTPBadRequest)
 
@@ -169,7 +169,7 @@ def process_upload(request):
 
     persist_upload = asbool(request.POST.get('persist_upload', False))
 
-    if 'can_persist_uploads' in list(request.registry.settings.keys()):
+    if 'can_persist_uploads' in request.registry.settings:
         can_persist = asbool(request.registry.settings['can_persist_uploads'])
     else:
         can_persist = False
@@ -244,7 +244,7 @@ def create_file_item(request):
     base_path = get_persistent_dir(request)
 
     try:
-        file_model = PyObjFromJson(ujson.loads(request.body))
+        file_model = PyObjFromJson(orjson.loads(request.body))
     except Exception:
         log.error('PUT command payload could not be parsed')
         raise cors_exception(request, HTTPBadRequest)